@@ -4,90 +4,58 @@ Add mock location data to restaurants for testing the map functionality.
 This provides approximate coordinates for NYC neighborhoods mentioned in descriptions.
 """
 
-import json
 import random
+import shutil
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Tuple
+import orjson
 
+from neighborhoods import NEIGHBORHOOD_COORDS, find_neighborhood
 
-# Approximate coordinates for NYC neighborhoods
-NEIGHBORHOOD_COORDS = {
-    "Manhattan": (40.7831, -73.9712),
-    "Brooklyn": (40.6782, -73.9442),
-    "Queens": (40.7282, -73.7949),
-    "Bronx": (40.8448, -73.8648),
-    "Staten Island": (40.5795, -74.1502),
-    "West Village": (40.7358, -74.0036),
-    "East Village": (40.7282, -73.9857),
-    "Greenwich Village": (40.7336, -74.0027),
-    "SoHo": (40.7231, -74.0026),
-    "NoMad": (40.7484, -73.9857),
-    "Midtown": (40.7549, -73.9840),
-    "Downtown": (40.7074, -74.0113),
-    "Upper West Side": (40.7870, -73.9754),
-    "Upper East Side": (40.7736, -73.9566),
-    "Chinatown": (40.7158, -73.9970),
-    "Little Italy": (40.7189, -73.9969),
-    "Koreatown": (40.7505, -73.9934),
-    "Harlem": (40.8075, -73.9626),
-    "Chelsea": (40.7505, -74.0018),
-    "Greenpoint": (40.7336, -73.9507),
-    "Williamsburg": (40.7081, -73.9571),
-    "Fort Greene": (40.6892, -73.9742),
-    "Prospect Heights": (40.6746, -73.9708),
-    "Bushwick": (40.6944, -73.9212),
-    "Red Hook": (40.6754, -74.0077),
-    "Sunset Park": (40.6455, -74.0124),
-    "Bensonhurst": (40.6018, -73.9944),
-    "Flushing": (40.7675, -73.8331),
-    "Jackson Heights": (40.7556, -73.8854),
-    "Elmhurst": (40.7365, -73.8776),
-    "Astoria": (40.7698, -73.9215),
-    "Long Island City": (40.7448, -73.9485),
-    "Bedford-Stuyvesant": (40.6834, -73.9389),
-    "Crown Heights": (40.6681, -73.9448),
-    "Park Slope": (40.6612, -73.9986),
-    "Bay Ridge": (40.6254, -74.0304),
-    "Sheepshead Bay": (40.5868, -73.9543),
-    "JFK": (40.6413, -73.7781),
-    "Times Square": (40.7580, -73.9855),
-    "Financial District": (40.7074, -74.0113),
-}
+# Maximum random variation (in degrees) added to avoid clustering markers
+NEIGHBORHOOD_JITTER = 0.01
+BOROUGH_JITTER = 0.02
 
+# Borough fallbacks in priority order: (lowercased key, name in NEIGHBORHOOD_COORDS)
+_BOROUGHS = (
+    ('manhattan', 'Manhattan'),
+    ('brooklyn', 'Brooklyn'),
+    ('queens', 'Queens'),
+    ('bronx', 'Bronx'),
+    ('staten island', 'Staten Island'),
+)
 
-def get_coordinates_for_restaurant(restaurant: Dict) -> tuple:
-    """Get approximate coordinates for a restaurant based on its description."""
+
+def get_coordinates_for_restaurant(restaurant: Dict, offset: Tuple[float, float]) -> tuple:
+    """Get approximate coordinates for a restaurant based on its description.
+    
+    offset is a pre-drawn (lat, lng) pair in [-1, 1], scaled by the jitter for the match type.
+    Returns (lat, lng, neighborhood), where neighborhood is the matched area name.
+    """
     
     description = restaurant.get('description', '').lower()
     name = restaurant.get('name', '').lower()
     
     # Check for specific neighborhood mentions
-    for neighborhood, coords in NEIGHBORHOOD_COORDS.items():
-        if neighborhood.lower() in description or neighborhood.lower() in name:
-            # Add some random variation to avoid clustering
-            lat_offset = random.uniform(-0.01, 0.01)
-            lng_offset = random.uniform(-0.01, 0.01)
-            return (coords[0] + lat_offset, coords[1] + lng_offset)
-    
-    # Check for borough mentions
-    if 'manhattan' in description or 'manhattan' in name:
-        base_coords = NEIGHBORHOOD_COORDS['Manhattan']
-    elif 'brooklyn' in description or 'brooklyn' in name:
-        base_coords = NEIGHBORHOOD_COORDS['Brooklyn']
-    elif 'queens' in description or 'queens' in name:
-        base_coords = NEIGHBORHOOD_COORDS['Queens']
-    elif 'bronx' in description or 'bronx' in name:
-        base_coords = NEIGHBORHOOD_COORDS['Bronx']
-    elif 'staten island' in description or 'staten island' in name:
-        base_coords = NEIGHBORHOOD_COORDS['Staten Island']
-    else:
-        # Default to Manhattan center with random variation
-        base_coords = NEIGHBORHOOD_COORDS['Manhattan']
+    neighborhood = find_neighborhood(description, name)
+    if neighborhood:
+        coords = NEIGHBORHOOD_COORDS[neighborhood]
+        # Add some random variation to avoid clustering
+        return (coords[0] + offset[0] * NEIGHBORHOOD_JITTER,
+                coords[1] + offset[1] * NEIGHBORHOOD_JITTER,
+                neighborhood)
+    
+    # Check for borough mentions, defaulting to Manhattan center
+    borough = next(
+        (borough_name for key, borough_name in _BOROUGHS if key in description or key in name),
+        'Manhattan'
+    )
+    base_coords = NEIGHBORHOOD_COORDS[borough]
     
     # Add random variation
-    lat_offset = random.uniform(-0.02, 0.02)
-    lng_offset = random.uniform(-0.02, 0.02)
-    return (base_coords[0] + lat_offset, base_coords[1] + lng_offset)
+    return (base_coords[0] + offset[0] * BOROUGH_JITTER,
+            base_coords[1] + offset[1] * BOROUGH_JITTER,
+            borough)
 
 
 def add_mock_locations(restaurants: List[Dict]) -> List[Dict]:
@@ -95,19 +63,13 @@ def add_mock_locations(restaurants: List[Dict]) -> List[Dict]:
     
     for restaurant in restaurants:
         if not restaurant.get('latitude') and not restaurant.get('longitude'):
-            lat, lng = get_coordinates_for_restaurant(restaurant)
+            offset = (random.uniform(-1, 1), random.uniform(-1, 1))
+            lat, lng, neighborhood = get_coordinates_for_restaurant(restaurant, offset)
             restaurant['latitude'] = round(lat, 6)
             restaurant['longitude'] = round(lng, 6)
             
-            # Add a mock formatted address
+            # Add a mock formatted address, using the neighborhood matched above
             if not restaurant.get('formatted_address'):
-                # Extract neighborhood from description or use Manhattan
-                neighborhood = "Manhattan"
-                for n in NEIGHBORHOOD_COORDS.keys():
-                    if n.lower() in restaurant.get('description', '').lower():
-                        neighborhood = n
-                        break
-                
                 restaurant['formatted_address'] = f"{restaurant['name']}, {neighborhood}, New York, NY"
             
             # Add mock place_id
@@ -130,21 +92,19 @@ def main():
         return
     
     # Load cleaned restaurants
-    with open(input_file, 'r', encoding='utf-8') as f:
-        restaurants = json.load(f)
+    with open(input_file, 'rb') as f:
+        restaurants = orjson.loads(f.read())
     
     print(f"Adding mock locations to {len(restaurants)} restaurants...")
     
     # Add mock locations
     restaurants_with_locations = add_mock_locations(restaurants)
     
-    # Save data with locations
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(restaurants_with_locations, f, indent=2, ensure_ascii=False)
+    # Save data with locations (serialized once, reused for the app copy)
+    output_file.write_bytes(orjson.dumps(restaurants_with_locations, option=orjson.OPT_INDENT_2))
     
     # Copy to app directory
-    with open(app_data_file, 'w', encoding='utf-8') as f:
-        json.dump(restaurants_with_locations, f, indent=2, ensure_ascii=False)
+    shutil.copyfile(output_file, app_data_file)
     
     print(f"\nSaved data with locations to: {output_file}")
     print(f"Copied to app directory: {app_data_file}")
@@ -4,12 +4,24 @@ Clean and prepare restaurant data for the Next.js app.
 This script cleans up the parsed data and adds basic improvements without requiring external APIs.
 """
 
-import json
+import gzip
 import re
+import shutil
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List
+import orjson
 
+from neighborhoods import MIN_NEIGHBORHOOD_LENGTH, find_neighborhood
 
+# Literal "\n" sequences or real newlines, and whitespace runs
+_NL_RE = re.compile(r'\\n|\n')
+_WS_RE = re.compile(r'\s+')
+
+PROGRESS_INTERVAL = 100  # Print progress every N restaurants
+
+
+@lru_cache(maxsize=512)
 def clean_price_range(price_range: str) -> str:
     """Clean and standardize price range formatting."""
     if not price_range:
@@ -25,6 +37,7 @@ def clean_price_range(price_range: str) -> str:
     return cleaned
 
 
+@lru_cache(maxsize=512)
 def clean_cuisine(cuisine: str) -> str:
     """Clean and standardize cuisine names."""
     if not cuisine:
@@ -49,11 +62,8 @@ def clean_description(description: str) -> str:
     if not description:
         return ""
     
-    # Remove literal \n characters and extra whitespace
-    cleaned = description.replace('\\n', ' ').replace('\n', ' ')
-    
-    # Remove extra whitespace and normalize
-    cleaned = re.sub(r'\s+', ' ', cleaned.strip())
+    # Remove literal \n characters and extra whitespace, then normalize
+    cleaned = _WS_RE.sub(' ', _NL_RE.sub(' ', description)).strip()
     
     # Remove trailing periods and add if missing
     if cleaned and not cleaned.endswith('.'):
@@ -64,28 +74,10 @@ def clean_description(description: str) -> str:
 
 def extract_neighborhood_from_description(description: str) -> str:
     """Try to extract neighborhood from description."""
-    if not description:
+    if not description or len(description) < MIN_NEIGHBORHOOD_LENGTH:
         return ""
     
-    # Common NYC neighborhoods mentioned in descriptions
-    neighborhoods = [
-        "Manhattan", "Brooklyn", "Queens", "Bronx", "Staten Island",
-        "West Village", "East Village", "Greenwich Village", "SoHo", "NoMad",
-        "Midtown", "Downtown", "Upper West Side", "Upper East Side",
-        "Chinatown", "Little Italy", "Koreatown", "Harlem", "Chelsea",
-        "Greenpoint", "Williamsburg", "Fort Greene", "Prospect Heights",
-        "Bushwick", "Red Hook", "Sunset Park", "Bensonhurst", "Flushing",
-        "Jackson Heights", "Elmhurst", "Astoria", "Long Island City",
-        "Bedford-Stuyvesant", "Crown Heights", "Park Slope", "Bay Ridge",
-        "Sheepshead Bay", "JFK", "Times Square", "Financial District"
-    ]
-    
-    description_lower = description.lower()
-    for neighborhood in neighborhoods:
-        if neighborhood.lower() in description_lower:
-            return neighborhood
-    
-    return ""
+    return find_neighborhood(description.lower()) or ""
 
 
 def clean_restaurant_data(restaurant: Dict) -> Dict:
@@ -125,6 +117,7 @@ def main():
     # Paths
     input_file = Path(__file__).parent.parent / 'data' / 'restaurants_parsed.json'
     output_file = Path(__file__).parent.parent / 'data' / 'restaurants_cleaned.json'
+    compressed_file = output_file.with_suffix('.json.gz')
     app_data_file = Path(__file__).parent.parent / 'app' / 'public' / 'data' / 'restaurants_parsed.json'
     
     if not input_file.exists():
@@ -132,27 +125,32 @@ def main():
         return
     
     # Load parsed restaurants
-    with open(input_file, 'r', encoding='utf-8') as f:
-        restaurants = json.load(f)
+    with open(input_file, 'rb') as f:
+        restaurants = orjson.loads(f.read())
     
     print(f"Cleaning {len(restaurants)} restaurants...")
     
     # Clean each restaurant
     cleaned_restaurants = []
     for i, restaurant in enumerate(restaurants):
-        print(f"Cleaning: {restaurant.get('name', 'Unknown')}")
+        if i % PROGRESS_INTERVAL == 0:
+            print(f"Cleaning {i}/{len(restaurants)}", flush=True)
         cleaned_restaurant = clean_restaurant_data(restaurant)
         cleaned_restaurants.append(cleaned_restaurant)
     
-    # Save cleaned data
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(cleaned_restaurants, f, indent=2, ensure_ascii=False)
+    # Save cleaned data (serialized once, reused for the app and compressed copies)
+    payload = orjson.dumps(cleaned_restaurants, option=orjson.OPT_INDENT_2)
+    output_file.write_bytes(payload)
+    
+    # Compressed copy for artifact uploads/transfers (level 1 is fast and still ~4x smaller)
+    with gzip.open(compressed_file, 'wb', compresslevel=1) as f:
+        f.write(payload)
     
     # Also copy to app public directory
-    with open(app_data_file, 'w', encoding='utf-8') as f:
-        json.dump(cleaned_restaurants, f, indent=2, ensure_ascii=False)
+    shutil.copyfile(output_file, app_data_file)
     
     print(f"\nSaved cleaned data to: {output_file}")
+    print(f"Saved compressed copy to: {compressed_file}")
     print(f"Copied to app directory: {app_data_file}")
     
     # Print summary
@@ -4,10 +4,88 @@ Deduplicate restaurants by place_id.
 When duplicates are found, merge their data intelligently.
 """
 
-import json
 from pathlib import Path
-from typing import Dict, List, Set
+from typing import Dict, Iterable, List, Set
 from collections import defaultdict
+import orjson
+
+# Fields filled from later duplicates when the merged entry lacks them
+_MERGE_FIELDS = ('name', 'description', 'formatted_address', 'website', 'phone',
+                 'google_maps_url', 'cuisine', 'price_range', 'image_url')
+
+
+def _source_list(restaurant: Dict) -> List[str]:
+    """Return a restaurant's sources as a list (a single source may be stored as a plain string)."""
+    sources = restaurant.get('sources')
+    if not sources:
+        return []
+    return sources if isinstance(sources, list) else [sources]
+
+
+def _combined_order(merged: Dict) -> int:
+    """Calculate combined_order based on best rank."""
+    if merged.get('nyt_rank'):
+        return merged['nyt_rank']
+    if merged.get('nym_rank'):
+        return 100 + merged['nym_rank']
+    return 999
+
+
+def _merge_fields(merged: Dict, r: Dict):
+    """Merge one duplicate entry into merged - prefer non-null values, and prefer more complete data."""
+    
+    # Prefer entries with more complete data
+    for field in _MERGE_FIELDS:
+        if not merged.get(field) and (value := r.get(field)):
+            merged[field] = value
+    
+    # Look up each field of the duplicate once
+    r_rating, r_review_count, r_latitude, r_opening_hours, r_last_updated = (
+        r.get('rating'), r.get('review_count'), r.get('latitude'),
+        r.get('opening_hours'), r.get('last_updated')
+    )
+    
+    # Prefer higher ratings
+    if r_rating and (not merged.get('rating') or r_rating > merged['rating']):
+        merged['rating'] = r_rating
+        merged['google_rating'] = r.get('google_rating', r_rating)
+    
+    # Prefer higher review counts
+    if r_review_count and (not merged.get('review_count') or r_review_count > merged['review_count']):
+        merged['review_count'] = r_review_count
+        merged['google_review_count'] = r.get('google_review_count', r_review_count)
+    
+    # Merge coordinates if missing
+    if r_latitude and not merged.get('latitude'):
+        merged['latitude'] = r_latitude
+        merged['longitude'] = r['longitude']
+    
+    # Merge opening hours if missing
+    if r_opening_hours and not merged.get('opening_hours'):
+        merged['opening_hours'] = r_opening_hours
+        merged['is_open_now'] = r.get('is_open_now')
+    
+    # Keep the most recent last_updated
+    if r_last_updated and (not merged.get('last_updated') or r_last_updated > merged['last_updated']):
+        merged['last_updated'] = r_last_updated
+
+
+def _merge_two(first: Dict, second: Dict) -> Dict:
+    """Merge exactly two entries - the common duplicate case, without the list/set setup."""
+    
+    merged = first.copy()
+    merged['sources'] = sorted({*_source_list(first), *_source_list(second)})
+    
+    # Keep the best (lowest) rank values
+    for field in ('nyt_rank', 'nym_rank'):
+        a, b = first.get(field), second.get(field)
+        if a or b:
+            merged[field] = min(a, b) if a and b else a or b
+    
+    merged['combined_order'] = _combined_order(merged)
+    _merge_fields(merged, second)
+    
+    return merged
 
 
 def merge_restaurant_data(restaurants: List[Dict]) -> Dict:
@@ -19,18 +97,14 @@ def merge_restaurant_data(restaurants: List[Dict]) -> Dict:
     if len(restaurants) == 1:
         return restaurants[0].copy()
     
+    if len(restaurants) == 2:
+        return _merge_two(restaurants[0], restaurants[1])
+    
     # Start with the first restaurant as base
     merged = restaurants[0].copy()
     
     # Combine sources from all entries
-    all_sources = set()
-    for r in restaurants:
-        sources = r.get('sources', [])
-        if isinstance(sources, list):
-            all_sources.update(sources)
-        elif sources:
-            all_sources.add(sources)
-    merged['sources'] = sorted(list(all_sources))
+    merged['sources'] = sorted(set().union(*(_source_list(r) for r in restaurants)))
     
     # Keep the best rank values
     nyt_ranks = [r.get('nyt_rank') for r in restaurants if r.get('nyt_rank')]
@@ -41,66 +115,39 @@ def merge_restaurant_data(restaurants: List[Dict]) -> Dict:
     if nym_ranks:
         merged['nym_rank'] = min(nym_ranks)
     
-    # Calculate combined_order based on best rank
-    if merged.get('nyt_rank'):
-        merged['combined_order'] = merged['nyt_rank']
-    elif merged.get('nym_rank'):
-        merged['combined_order'] = 100 + merged['nym_rank']
-    else:
-        merged['combined_order'] = 999
+    merged['combined_order'] = _combined_order(merged)
     
-    # Merge other fields - prefer non-null values, and prefer more complete data
+    # Merge other fields from the remaining entries
     for r in restaurants[1:]:
-        # Prefer entries with more complete data
-        for field in ['name', 'description', 'formatted_address', 'website', 'phone', 
-                     'google_maps_url', 'cuisine', 'price_range', 'image_url']:
-            if not merged.get(field) and r.get(field):
-                merged[field] = r[field]
-        
-        # Prefer higher ratings
-        if r.get('rating') and (not merged.get('rating') or r.get('rating') > merged.get('rating')):
-            merged['rating'] = r['rating']
-            merged['google_rating'] = r.get('google_rating', r['rating'])
-        
-        # Prefer higher review counts
-        if r.get('review_count') and (not merged.get('review_count') or r.get('review_count') > merged.get('review_count')):
-            merged['review_count'] = r['review_count']
-            merged['google_review_count'] = r.get('google_review_count', r['review_count'])
-        
-        # Merge coordinates if missing
-        if not merged.get('latitude') and r.get('latitude'):
-            merged['latitude'] = r['latitude']
-            merged['longitude'] = r['longitude']
-        
-        # Merge opening hours if missing
-        if not merged.get('opening_hours') and r.get('opening_hours'):
-            merged['opening_hours'] = r['opening_hours']
-            merged['is_open_now'] = r.get('is_open_now')
-        
-        # Keep the most recent last_updated
-        if r.get('last_updated') and (not merged.get('last_updated') or r.get('last_updated') > merged.get('last_updated')):
-            merged['last_updated'] = r['last_updated']
+        _merge_fields(merged, r)
     
     return merged
 
 
-def deduplicate_restaurants(restaurants: List[Dict]) -> List[Dict]:
-    """Deduplicate restaurants by place_id."""
+def deduplicate_restaurants(restaurants: Iterable[Dict]) -> List[Dict]:
+    """Deduplicate restaurants by place_id.
+    
+    Groups in a single pass over any iterable. Unique restaurants are passed through
+    as-is (not copied), so the caller should not reuse the input records.
+    """
     
     # Group restaurants by place_id
     by_place_id = defaultdict(list)
-    no_place_id = []
+    unkeyed_count = 0
     
     for restaurant in restaurants:
-        place_id = restaurant.get('place_id')
-        if place_id:
-            by_place_id[place_id].append(restaurant)
-        else:
+        key = restaurant.get('place_id')
+        if not key:
             # For restaurants without place_id, use name+address as key
-            name = restaurant.get('name', '').lower().strip()
-            address = restaurant.get('formatted_address', '').lower().strip()
-            key = f"{name}::{address}" if name and address else f"no-place-id-{len(no_place_id)}"
-            by_place_id[key].append(restaurant)
+            name = (restaurant.get('name') or '').strip().lower()
+            address = (restaurant.get('formatted_address') or '').strip().lower() if name else ''
+            if name and address:
+                key = f"{name}::{address}"
+            else:
+                # Nothing to match on - keep the restaurant as its own group
+                key = f"no-place-id-{unkeyed_count}"
+                unkeyed_count += 1
+        by_place_id[key].append(restaurant)
     
     # Merge duplicates
     deduplicated = []
@@ -116,7 +163,7 @@ def deduplicate_restaurants(restaurants: List[Dict]) -> List[Dict]:
             merged = merge_restaurant_data(group)
             deduplicated.append(merged)
         else:
-            deduplicated.append(group[0].copy())
+            deduplicated.append(group[0])
     
     # Sort by combined_order
     deduplicated.sort(key=lambda x: x.get('combined_order', 999))
@@ -136,8 +183,8 @@ def main():
     
     # Load restaurants
     print(f"Loading restaurants from: {input_file}")
-    with open(input_file, 'r', encoding='utf-8') as f:
-        restaurants = json.load(f)
+    with open(input_file, 'rb') as f:
+        restaurants = orjson.loads(f.read())
     
     print(f"Loaded {len(restaurants)} restaurants")
     
@@ -159,8 +206,8 @@ def main():
     
     # Save deduplicated data
     print(f"\n💾 Saving to: {output_file}")
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(deduplicated, f, indent=2, ensure_ascii=False)
+    with open(output_file, 'wb') as f:
+        f.write(orjson.dumps(deduplicated, option=orjson.OPT_INDENT_2))
     
     print(f"✅ Saved {len(deduplicated)} restaurants to {output_file}")
 
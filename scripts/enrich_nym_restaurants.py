@@ -4,21 +4,15 @@ Enrich NYM restaurants with Google Places API data.
 For restaurants that don't have place_id, search and fetch details.
 """
 
-import json
-import os
 import time
 from pathlib import Path
 from typing import Dict, List, Optional
+import orjson
 import requests
-from dotenv import load_dotenv
-
-# Load environment variables
-load_dotenv('.env.local')
-load_dotenv()
-
-# Google Places API (New) configuration
-GOOGLE_PLACES_API_KEY = os.getenv('GOOGLE_PLACES_API_KEY')
-BASE_URL = 'https://places.googleapis.com/v1'
+from places_client import (
+    GOOGLE_PLACES_API_KEY, BASE_URL, REQUEST_TIMEOUT, NYM_CACHE_EXPIRE,
+    cached, coerce_rating, run_rate_limited, session, wait_for_rate_limit,
+)
 
 # NYC bounds for filtering results
 NYC_BOUNDS = {
@@ -57,85 +51,57 @@ def search_place_by_name_and_address(name: str, address: str = None) -> Optional
         }
     }
     
-    # Field mask for the new API
-    field_mask = "places.id,places.displayName,places.rating,places.userRatingCount,places.formattedAddress,places.location,places.types"
+    # Field mask for the new API - also requests the detail fields, so the chosen
+    # result can be used directly without a second Place Details request
+    field_mask = ("places.id,places.displayName,places.rating,places.userRatingCount,places.formattedAddress,places.location,places.types,"
+                  "places.regularOpeningHours,places.websiteUri,places.googleMapsUri,places.nationalPhoneNumber,places.editorialSummary")
     
     headers = {
         'Content-Type': 'application/json',
-        'X-Goog-Api-Key': GOOGLE_PLACES_API_KEY,
         'X-Goog-FieldMask': field_mask
     }
     
-    try:
-        response = requests.post(f"{BASE_URL}/places:searchText", 
-                              json=request_body, 
-                              headers=headers)
-        response.raise_for_status()
-        
-        data = response.json()
-        
-        if 'places' not in data or not data['places']:
-            print(f"No results found for '{name}'")
-            return None
-        
-        results = data['places']
-        
-        # Filter results to NYC area and find best match
-        nyc_results = []
-        for result in results:
-            location = result.get('location', {})
-            lat = location.get('latitude')
-            lng = location.get('longitude')
+    def fetch() -> Optional[Dict]:
+        try:
+            wait_for_rate_limit()
+            response = session.post(f"{BASE_URL}/places:searchText", 
+                                  json=request_body, 
+                                  headers=headers,
+                                  timeout=REQUEST_TIMEOUT)
+            response.raise_for_status()
+            
+            data = response.json()
+            
+            if 'places' not in data or not data['places']:
+                print(f"No results found for '{name}'")
+                return None
             
-            if lat and lng and is_in_nyc_bounds(lat, lng):
-                nyc_results.append(result)
+            results = data['places']
+            
+            # Filter results to NYC area and find best match
+            nyc_results = []
+            for result in results:
+                location = result.get('location', {})
+                lat = location.get('latitude')
+                lng = location.get('longitude')
+                
+                if lat and lng and is_in_nyc_bounds(lat, lng):
+                    nyc_results.append(result)
+            
+            if not nyc_results:
+                print(f"No NYC results found for '{name}'")
+                return None
+            
+            # Return the highest rated result in NYC
+            best_result = max(nyc_results, key=lambda result: coerce_rating(result.get('rating')) or 0)
+            return best_result
         
-        if not nyc_results:
-            print(f"No NYC results found for '{name}'")
+        except requests.RequestException as e:
+            print(f"Request error for '{name}': {e}")
             return None
-        
-        # Return the highest rated result in NYC
-        def get_rating_value(result):
-            rating = result.get('rating', {})
-            if isinstance(rating, dict):
-                return rating.get('value', 0)
-            elif isinstance(rating, (int, float)):
-                return rating
-            else:
-                return 0
-        
-        best_result = max(nyc_results, key=get_rating_value)
-        return best_result
-        
-    except requests.RequestException as e:
-        print(f"Request error for '{name}': {e}")
-        return None
-
-
-def get_place_details(place_id: str) -> Optional[Dict]:
-    """Get detailed information for a place using Place Details API (New)."""
     
-    if not GOOGLE_PLACES_API_KEY:
-        return None
-    
-    # Field mask for place details (New API format) - include editorialSummary
-    field_mask = "id,displayName,formattedAddress,location,regularOpeningHours,websiteUri,googleMapsUri,nationalPhoneNumber,rating,userRatingCount,editorialSummary"
-    
-    headers = {
-        'X-Goog-Api-Key': GOOGLE_PLACES_API_KEY,
-        'X-Goog-FieldMask': field_mask
-    }
-    
-    try:
-        response = requests.get(f"{BASE_URL}/places/{place_id}", headers=headers)
-        response.raise_for_status()
-        
-        data = response.json()
-        return data
-        
-    except requests.RequestException as e:
-        print(f"Place Details request error: {e}")
-        return None
+    # Responses depend on the field mask, so it is part of the cache key
+    return cached(('search', query, field_mask), fetch, NYM_CACHE_EXPIRE)
 
 
 def is_in_nyc_bounds(lat: float, lng: float) -> bool:
@@ -148,11 +114,9 @@ def enrich_nym_restaurant(restaurant: Dict) -> Dict:
     """Enrich a single NYM restaurant with Google Places data."""
     
     name = restaurant.get('name', 'Unknown')
-    print(f"\n🔍 Enriching: {name}")
     
     # Skip if already has place_id
     if restaurant.get('place_id'):
-        print(f"   ✅ Already has place_id: {restaurant['place_id']}")
         return restaurant
     
     # Search for the restaurant
@@ -160,33 +124,23 @@ def enrich_nym_restaurant(restaurant: Dict) -> Dict:
     search_result = search_place_by_name_and_address(name, address)
     
     if not search_result:
-        print(f"   ❌ Failed to find: {name}")
+        print(f"❌ Failed to find: {name}")
         return restaurant
     
     place_id = search_result.get('id')
     if not place_id:
-        print(f"   ❌ No place_id for: {name}")
+        print(f"❌ No place_id for: {name}")
         return restaurant
     
-    print(f"   ✅ Found place_id: {place_id}")
-    
-    # Get detailed information
-    details = get_place_details(place_id)
-    if not details:
-        print(f"   ❌ Failed to get details for: {name}")
-        return restaurant
+    # The search result already carries the detail fields
+    details = search_result
     
     # Add enriched data
     restaurant['place_id'] = place_id
     
-    # Handle rating extraction safely
-    rating = details.get('rating', {})
-    if isinstance(rating, dict):
-        restaurant['google_rating'] = rating.get('value')
-        restaurant['rating'] = rating.get('value')  # Also set main rating field
-    elif isinstance(rating, (int, float)):
-        restaurant['google_rating'] = rating
-        restaurant['rating'] = rating
+    rating = coerce_rating(details.get('rating', {}))
+    restaurant['google_rating'] = rating
+    restaurant['rating'] = rating  # Also set main rating field
     
     restaurant['google_review_count'] = details.get('userRatingCount')
     restaurant['review_count'] = details.get('userRatingCount')
@@ -223,10 +177,6 @@ def enrich_nym_restaurant(restaurant: Dict) -> Dict:
     # Timestamp
     restaurant['last_updated'] = time.strftime('%Y-%m-%d %H:%M:%S')
     
-    print(f"   ✅ Successfully enriched: {name}")
-    print(f"   📍 Address: {restaurant.get('formatted_address', 'N/A')}")
-    print(f"   🌟 Google Rating: {restaurant.get('google_rating', 'N/A')}")
-    
     return restaurant
 
 
@@ -248,8 +198,8 @@ def main():
         return
     
     # Load merged restaurants
-    with open(input_file, 'r', encoding='utf-8') as f:
-        restaurants = json.load(f)
+    with open(input_file, 'rb') as f:
+        restaurants = orjson.loads(f.read())
     
     # Filter to only NYM restaurants that need enrichment
     nym_restaurants = [r for r in restaurants if 'NYM' in r.get('sources', [])]
@@ -262,25 +212,24 @@ def main():
     all_restaurants_dict = {i: r for i, r in enumerate(restaurants)}
     enriched_indices = set()
     
-    for i, restaurant in enumerate(restaurants_to_enrich):
-        print(f"\n📊 Progress: {i+1}/{len(restaurants_to_enrich)}")
-        
-        enriched_restaurant = enrich_nym_restaurant(restaurant)
-        
-        # Find the index in the full list and update it
-        for idx, r in enumerate(restaurants):
-            if (r.get('name') == enriched_restaurant.get('name') and 
-                'NYM' in r.get('sources', [])):
+    # Index NYM restaurants by name so results can be written back in O(1)
+    name_to_idx = {}
+    for idx, r in enumerate(restaurants):
+        if 'NYM' in r.get('sources', []):
+            name_to_idx.setdefault(r.get('name'), idx)
+    
+    # Enrich concurrently
+    with run_rate_limited(enrich_nym_restaurant, restaurants_to_enrich) as results:
+        for _, enriched_restaurant in results:
+            # Update the restaurant in the full list
+            idx = name_to_idx.get(enriched_restaurant.get('name'))
+            if idx is not None:
                 restaurants[idx] = enriched_restaurant
                 enriched_indices.add(idx)
-                break
-        
-        # Rate limiting - Google Places API has quotas
-        time.sleep(0.2)  # 200ms delay between requests
     
     # Save enriched data
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(restaurants, f, indent=2, ensure_ascii=False)
+    with open(output_file, 'wb') as f:
+        f.write(orjson.dumps(restaurants, option=orjson.OPT_INDENT_2))
     
     print(f"\nSaved enriched data to: {output_file}")
     
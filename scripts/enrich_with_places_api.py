@@ -4,21 +4,15 @@ Enrich restaurant data with Google Places API (New).
 Fetches: place_id, address, coordinates, hours, website, phone, Google Maps URL
 """
 
-import json
-import os
 import time
 from pathlib import Path
 from typing import Dict, List, Optional
+import orjson
 import requests
-from dotenv import load_dotenv
-
-# Load environment variables
-load_dotenv('.env.local')
-load_dotenv()  # Also try default .env file
-
-# Google Places API (New) configuration
-GOOGLE_PLACES_API_KEY = os.getenv('GOOGLE_PLACES_API_KEY')
-BASE_URL = 'https://places.googleapis.com/v1'
+from places_client import (
+    GOOGLE_PLACES_API_KEY, BASE_URL, REQUEST_TIMEOUT, NYT_CACHE_EXPIRE,
+    cached, coerce_rating, run_rate_limited, session, wait_for_rate_limit,
+)
 
 # NYC bounds for filtering results
 NYC_BOUNDS = {
@@ -54,85 +48,57 @@ def search_place_by_name(restaurant_name: str) -> Optional[Dict]:
         }
     }
     
-    # Field mask for the new API
-    field_mask = "places.id,places.displayName,places.rating,places.userRatingCount,places.formattedAddress,places.location,places.types"
+    # Field mask for the new API - also requests the detail fields, so the chosen
+    # result can be used directly without a second Place Details request
+    field_mask = ("places.id,places.displayName,places.rating,places.userRatingCount,places.formattedAddress,places.location,places.types,"
+                  "places.regularOpeningHours,places.websiteUri,places.googleMapsUri,places.nationalPhoneNumber")
     
     headers = {
         'Content-Type': 'application/json',
-        'X-Goog-Api-Key': GOOGLE_PLACES_API_KEY,
         'X-Goog-FieldMask': field_mask
     }
     
-    try:
-        response = requests.post(f"{BASE_URL}/places:searchText", 
-                              json=request_body, 
-                              headers=headers)
-        response.raise_for_status()
-        
-        data = response.json()
-        
-        if 'places' not in data or not data['places']:
-            print(f"No results found for '{restaurant_name}'")
-            return None
-        
-        results = data['places']
-        
-        # Filter results to NYC area and find best match
-        nyc_results = []
-        for result in results:
-            location = result.get('location', {})
-            lat = location.get('latitude')
-            lng = location.get('longitude')
+    def fetch() -> Optional[Dict]:
+        try:
+            wait_for_rate_limit()
+            response = session.post(f"{BASE_URL}/places:searchText", 
+                                  json=request_body, 
+                                  headers=headers,
+                                  timeout=REQUEST_TIMEOUT)
+            response.raise_for_status()
+            
+            data = response.json()
+            
+            if 'places' not in data or not data['places']:
+                print(f"No results found for '{restaurant_name}'")
+                return None
             
-            if lat and lng and is_in_nyc_bounds(lat, lng):
-                nyc_results.append(result)
+            results = data['places']
+            
+            # Filter results to NYC area and find best match
+            nyc_results = []
+            for result in results:
+                location = result.get('location', {})
+                lat = location.get('latitude')
+                lng = location.get('longitude')
+                
+                if lat and lng and is_in_nyc_bounds(lat, lng):
+                    nyc_results.append(result)
+            
+            if not nyc_results:
+                print(f"No NYC results found for '{restaurant_name}'")
+                return None
+            
+            # Return the highest rated result in NYC
+            best_result = max(nyc_results, key=lambda result: coerce_rating(result.get('rating')) or 0)
+            return best_result
         
-        if not nyc_results:
-            print(f"No NYC results found for '{restaurant_name}'")
+        except requests.RequestException as e:
+            print(f"Request error for '{restaurant_name}': {e}")
             return None
-        
-        # Return the highest rated result in NYC
-        def get_rating_value(result):
-            rating = result.get('rating', {})
-            if isinstance(rating, dict):
-                return rating.get('value', 0)
-            elif isinstance(rating, (int, float)):
-                return rating
-            else:
-                return 0
-        
-        best_result = max(nyc_results, key=get_rating_value)
-        return best_result
-        
-    except requests.RequestException as e:
-        print(f"Request error for '{restaurant_name}': {e}")
-        return None
-
-
-def get_place_details(place_id: str) -> Optional[Dict]:
-    """Get detailed information for a place using Place Details API (New)."""
     
-    if not GOOGLE_PLACES_API_KEY:
-        return None
-    
-    # Field mask for place details (New API format)
-    field_mask = "id,displayName,formattedAddress,location,regularOpeningHours,websiteUri,googleMapsUri,nationalPhoneNumber,rating,userRatingCount"
-    
-    headers = {
-        'X-Goog-Api-Key': GOOGLE_PLACES_API_KEY,
-        'X-Goog-FieldMask': field_mask
-    }
-    
-    try:
-        response = requests.get(f"{BASE_URL}/places/{place_id}", headers=headers)
-        response.raise_for_status()
-        
-        data = response.json()
-        return data
-        
-    except requests.RequestException as e:
-        print(f"Place Details request error: {e}")
-        return None
+    # Responses depend on the field mask, so it is part of the cache key
+    return cached(('search', query, field_mask), fetch, NYT_CACHE_EXPIRE)
 
 
 def is_in_nyc_bounds(lat: float, lng: float) -> bool:
@@ -144,41 +110,24 @@ def is_in_nyc_bounds(lat: float, lng: float) -> bool:
 def enrich_restaurant_data(restaurant: Dict) -> Dict:
     """Enrich a single restaurant with Google Places data."""
     
-    print(f"\n🔍 Enriching: {restaurant['name']}")
-    print(f"   Original rating: {restaurant.get('rating', 'N/A')}")
-    print(f"   Original cuisine: {restaurant.get('cuisine', 'N/A')}")
-    
     # Search for the restaurant
     search_result = search_place_by_name(restaurant['name'])
     if not search_result:
-        print(f"   ❌ Failed to find: {restaurant['name']}")
+        print(f"❌ Failed to find: {restaurant['name']}")
         return restaurant
     
     place_id = search_result.get('id')
     if not place_id:
-        print(f"   ❌ No place_id for: {restaurant['name']}")
+        print(f"❌ No place_id for: {restaurant['name']}")
         return restaurant
     
-    print(f"   ✅ Found place_id: {place_id}")
-    
-    # Get detailed information
-    details = get_place_details(place_id)
-    if not details:
-        print(f"   ❌ Failed to get details for: {restaurant['name']}")
-        return restaurant
+    # The search result already carries the detail fields
+    details = search_result
     
     # Add enriched data
     restaurant['place_id'] = place_id
     
-    # Handle rating extraction safely
-    rating = details.get('rating', {})
-    if isinstance(rating, dict):
-        restaurant['google_rating'] = rating.get('value')
-    elif isinstance(rating, (int, float)):
-        restaurant['google_rating'] = rating
-    else:
-        restaurant['google_rating'] = None
-        
+    restaurant['google_rating'] = coerce_rating(details.get('rating', {}))
     restaurant['google_review_count'] = details.get('userRatingCount')
     restaurant['formatted_address'] = details.get('formattedAddress')
     
@@ -202,17 +151,6 @@ def enrich_restaurant_data(restaurant: Dict) -> Dict:
     # Timestamp
     restaurant['last_updated'] = time.strftime('%Y-%m-%d %H:%M:%S')
     
-    # Debug output
-    print(f"   ✅ Successfully enriched: {restaurant['name']}")
-    print(f"   📍 Address: {restaurant.get('formatted_address', 'N/A')}")
-    print(f"   🌟 Google Rating: {restaurant.get('google_rating', 'N/A')}")
-    print(f"   📊 Google Reviews: {restaurant.get('google_review_count', 'N/A')}")
-    print(f"   📞 Phone: {restaurant.get('phone', 'N/A')}")
-    print(f"   🌐 Website: {restaurant.get('website', 'N/A')}")
-    print(f"   🕒 Open Now: {restaurant.get('is_open_now', 'N/A')}")
-    if restaurant.get('latitude') and restaurant.get('longitude'):
-        print(f"   📍 Coordinates: {restaurant['latitude']:.6f}, {restaurant['longitude']:.6f}")
-    
     return restaurant
 
 
@@ -233,24 +171,20 @@ def main():
         return
     
     # Load parsed restaurants
-    with open(input_file, 'r', encoding='utf-8') as f:
-        restaurants = json.load(f)
+    with open(input_file, 'rb') as f:
+        restaurants = orjson.loads(f.read())
     
     print(f"🚀 Enriching all {len(restaurants)} restaurants...")
     
-    enriched_restaurants = []
-    for i, restaurant in enumerate(restaurants):
-        print(f"\n📊 Progress: {i+1}/{len(restaurants)}")
-        
-        enriched_restaurant = enrich_restaurant_data(restaurant)
-        enriched_restaurants.append(enriched_restaurant)
-        
-        # Rate limiting - Google Places API has quotas
-        time.sleep(0.2)  # 200ms delay between requests
+    # Enrich concurrently, keeping the original (rank) order
+    enriched_restaurants = list(restaurants)
+    with run_rate_limited(enrich_restaurant_data, restaurants) as results:
+        for index, enriched_restaurant in results:
+            enriched_restaurants[index] = enriched_restaurant
     
     # Save enriched data
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(enriched_restaurants, f, indent=2, ensure_ascii=False)
+    with open(output_file, 'wb') as f:
+        f.write(orjson.dumps(enriched_restaurants, option=orjson.OPT_INDENT_2))
     
     print(f"\nSaved enriched data to: {output_file}")
     
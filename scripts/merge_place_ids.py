@@ -4,18 +4,20 @@ Merge place_ids from original enriched data into merged restaurant data.
 This ensures all NYT restaurants have their place_ids preserved.
 """
 
-import json
+import orjson
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List, Optional
 
 
+@lru_cache(maxsize=4096)
 def normalize_name(name: str) -> str:
     """Normalize restaurant name for matching."""
     if not name:
         return ""
     normalized = name.lower().strip()
-    normalized = name.replace("'", "'").replace("'", "'")  # Handle different apostrophes
-    normalized = name.replace("&", "and")
+    normalized = normalized.replace("\u2019", "'").replace("\u2018", "'")  # Handle different apostrophes
+    normalized = normalized.replace("&", "and")
     # Remove common punctuation
     normalized = normalized.replace(".", "").replace(",", "")
     # Remove extra whitespace
@@ -23,7 +25,21 @@ def normalize_name(name: str) -> str:
     return normalized
 
 
-def find_matching_restaurant(restaurant: Dict, enriched_restaurants: List[Dict]) -> Optional[Dict]:
+def build_match_index(enriched_restaurants: List[Dict]) -> Dict:
+    """Normalize enriched names once and index them by full name and by name token."""
+    index = {'restaurants': enriched_restaurants, 'name_tokens': [], 'lookup': {}, 'tokens': {}}
+    for idx, enriched in enumerate(enriched_restaurants):
+        name = normalize_name(enriched.get('name', ''))
+        name_tokens = frozenset(name.split())
+        index['name_tokens'].append(name_tokens)
+        if name:
+            index['lookup'].setdefault(name, []).append(enriched)
+        for token in name_tokens:
+            index['tokens'].setdefault(token, []).append(idx)
+    return index
+
+
+def find_matching_restaurant(restaurant: Dict, index: Dict) -> Optional[Dict]:
     """Find matching restaurant in enriched data by name and address."""
     
     name = normalize_name(restaurant.get('name', ''))
@@ -33,15 +49,22 @@ def find_matching_restaurant(restaurant: Dict, enriched_restaurants: List[Dict])
         return None
     
     # Try exact name match first
-    for enriched in enriched_restaurants:
-        enriched_name = normalize_name(enriched.get('name', ''))
-        if name == enriched_name:
-            return enriched
-    
-    # Try partial match
-    for enriched in enriched_restaurants:
-        enriched_name = normalize_name(enriched.get('name', ''))
-        if name in enriched_name or enriched_name in name:
+    exact_matches = index['lookup'].get(name)
+    if exact_matches:
+        return exact_matches[0]
+    
+    # Try partial match (every word of one name appears in the other), only against
+    # restaurants sharing a name token (in original order)
+    name_tokens = frozenset(name.split())
+    tokens = index['tokens']
+    candidates = set()
+    for token in name_tokens:
+        candidates.update(tokens.get(token, ()))
+    
+    for idx in sorted(candidates):
+        enriched = index['restaurants'][idx]
+        enriched_tokens = index['name_tokens'][idx]
+        if name_tokens <= enriched_tokens or enriched_tokens <= name_tokens:
             # Also check address if available
             if address and enriched.get('formatted_address'):
                 if address.lower() in enriched.get('formatted_address', '').lower() or \
@@ -57,24 +80,18 @@ def merge_place_ids(merged_file: Path, enriched_file: Path, output_file: Path):
     """Merge place_ids from enriched data into merged data."""
     
     # Load merged restaurants
-    with open(merged_file, 'r', encoding='utf-8') as f:
-        merged_restaurants = json.load(f)
+    with open(merged_file, 'rb') as f:
+        merged_restaurants = orjson.loads(f.read())
     
     # Load original enriched restaurants
-    with open(enriched_file, 'r', encoding='utf-8') as f:
-        enriched_restaurants = json.load(f)
+    with open(enriched_file, 'rb') as f:
+        enriched_restaurants = orjson.loads(f.read())
     
     print(f"Loaded {len(merged_restaurants)} merged restaurants")
     print(f"Loaded {len(enriched_restaurants)} enriched restaurants")
     
-    # Create a lookup by name for faster matching
-    enriched_lookup = {}
-    for enriched in enriched_restaurants:
-        name = normalize_name(enriched.get('name', ''))
-        if name:
-            if name not in enriched_lookup:
-                enriched_lookup[name] = []
-            enriched_lookup[name].append(enriched)
+    # Index enriched restaurants by name for faster matching
+    index = build_match_index(enriched_restaurants)
     
     updated_count = 0
     missing_count = 0
@@ -90,7 +107,7 @@ def merge_place_ids(merged_file: Path, enriched_file: Path, output_file: Path):
             continue
         
         # Find matching enriched restaurant
-        match = find_matching_restaurant(restaurant, enriched_restaurants)
+        match = find_matching_restaurant(restaurant, index)
         
         if match and match.get('place_id'):
             # Copy place_id and other enriched fields if missing
@@ -130,8 +147,8 @@ def merge_place_ids(merged_file: Path, enriched_file: Path, output_file: Path):
         print(f"⚠️  {missing_count} NYT restaurants still missing place_ids")
     
     # Save updated data
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(merged_restaurants, f, indent=2, ensure_ascii=False)
+    with open(output_file, 'wb') as f:
+        f.write(orjson.dumps(merged_restaurants, option=orjson.OPT_INDENT_2))
     
     print(f"\n💾 Saved updated data to: {output_file}")
 
@@ -4,12 +4,31 @@ Merge NYT and NYM restaurant lists.
 Matches restaurants by name and address, adds source tags, and calculates combined_order.
 """
 
-import json
+import orjson
 import re
+from functools import lru_cache
+from operator import itemgetter
 from pathlib import Path
 from typing import Dict, List, Optional
 
+# Street type abbreviations, applied in a single regex pass
+_ABBREVIATIONS = {
+    'street': 'st',
+    'avenue': 'ave',
+    'boulevard': 'blvd',
+    'place': 'pl',
+    'road': 'rd',
+    'drive': 'dr',
+}
+_RE_ABBREVIATION = re.compile(r'\b(' + '|'.join(_ABBREVIATIONS) + r')\b')
+_RE_PUNCT = re.compile(r'[^\w\s]')
+_RE_STREETNUM = re.compile(r'(\d+)\s+([\w\s]+)')
 
+# Exact name (10 + 5) and exact address (10 + 5) - nothing can score higher
+MAX_MATCH_SCORE = 30
+
+
+@lru_cache(maxsize=4096)
 def normalize_name(name: str) -> str:
     """Normalize restaurant name for matching."""
     if not name:
@@ -17,12 +36,13 @@ def normalize_name(name: str) -> str:
     # Convert to lowercase, remove extra spaces, remove common punctuation
     normalized = name.lower().strip()
     # Remove common punctuation that might differ
-    normalized = re.sub(r'[^\w\s]', '', normalized)
+    normalized = _RE_PUNCT.sub('', normalized)
     # Remove extra whitespace
-    normalized = re.sub(r'\s+', ' ', normalized)
+    normalized = ' '.join(normalized.split())
     return normalized
 
 
+@lru_cache(maxsize=4096)
 def normalize_address(address: str) -> str:
     """Normalize address for matching."""
     if not address:
@@ -30,20 +50,93 @@ def normalize_address(address: str) -> str:
     # Convert to lowercase, remove extra spaces
     normalized = address.lower().strip()
     # Standardize common abbreviations
-    normalized = re.sub(r'\bstreet\b', 'st', normalized)
-    normalized = re.sub(r'\bavenue\b', 'ave', normalized)
-    normalized = re.sub(r'\bboulevard\b', 'blvd', normalized)
-    normalized = re.sub(r'\bplace\b', 'pl', normalized)
-    normalized = re.sub(r'\broad\b', 'rd', normalized)
-    normalized = re.sub(r'\bdrive\b', 'dr', normalized)
+    normalized = _RE_ABBREVIATION.sub(lambda m: _ABBREVIATIONS[m.group(1)], normalized)
     # Remove common punctuation
-    normalized = re.sub(r'[^\w\s]', '', normalized)
+    normalized = _RE_PUNCT.sub('', normalized)
     # Remove extra whitespace
-    normalized = re.sub(r'\s+', ' ', normalized)
+    normalized = ' '.join(normalized.split())
     return normalized
 
 
-def find_matching_restaurant(nym_restaurant: Dict, nyt_restaurants: List[Dict]) -> Optional[int]:
+def street_key(address: str) -> Optional[tuple]:
+    """Street number and the start of the street name from a normalized address."""
+    street_match = _RE_STREETNUM.search(address)
+    if street_match:
+        return street_match.group(1), street_match.group(2).strip()[:10]
+    return None
+
+
+def index_record(address: str) -> tuple:
+    """Normalized address plus its precomputed street key."""
+    return address, street_key(address)
+
+
+def index_restaurant(index: Dict, restaurant: Dict):
+    """Add a restaurant's normalized name/address to the match index, at the next position."""
+    idx = len(index['records'])
+    name = normalize_name(restaurant.get('name', ''))
+    name_tokens = frozenset(name.split())
+    index['records'].append((name, name_tokens) + index_record(normalize_address(restaurant.get('formatted_address', ''))))
+    index['names'].setdefault(name, idx)
+    for token in name_tokens:
+        index['tokens'].setdefault(token, []).append(idx)
+
+
+def build_match_index(restaurants: List[Dict]) -> Dict:
+    """Normalize names/addresses once and map each name token to the restaurants containing it."""
+    index = {'records': [], 'names': {}, 'tokens': {}}
+    for restaurant in restaurants:
+        index_restaurant(index, restaurant)
+    return index
+
+
+def score_match(nym_name: str, nym_tokens: frozenset, nym_address: str, nym_street: Optional[tuple],
+                record: tuple) -> int:
+    """Score how well a NYM restaurant matches an indexed NYT record (0 if names don't match)."""
+    nyt_name, nyt_tokens, nyt_address, nyt_street = record
+    
+    # Name match (exact or fuzzy)
+    name_match = False
+    if nym_name == nyt_name:
+        name_match = True
+    elif nym_tokens <= nyt_tokens or nyt_tokens <= nym_tokens:
+        # Partial match - every word of one name appears in the other
+        name_match = True
+    
+    if not name_match:
+        return 0
+    
+    # Address match (if both have addresses)
+    address_match = False
+    if nym_address and nyt_address:
+        # Check if addresses are similar
+        if nym_address == nyt_address:
+            address_match = True
+        elif nym_address in nyt_address or nyt_address in nym_address:
+            # Partial match
+            address_match = True
+        # Compare street number and name for better matching
+        if nym_street and nym_street == nyt_street:
+            address_match = True
+    elif not nym_address or not nyt_address:
+        # If one doesn't have address, still consider it a match if name matches well
+        address_match = True
+    
+    # Calculate match score
+    score = 0
+    if name_match:
+        score += 10
+        if nym_name == nyt_name:
+            score += 5  # Exact name match
+    if address_match:
+        score += 10
+        if nym_address == nyt_address:
+            score += 5  # Exact address match
+    
+    return score
+
+
+def find_matching_restaurant(nym_restaurant: Dict, index: Dict) -> Optional[int]:
     """Find matching NYT restaurant by name and address. Returns index if found."""
     
     nym_name = normalize_name(nym_restaurant.get('name', ''))
@@ -52,55 +145,23 @@ def find_matching_restaurant(nym_restaurant: Dict, nyt_restaurants: List[Dict])
     if not nym_name:
         return None
     
+    nym_tokens = frozenset(nym_name.split())
+    nym_street = street_key(nym_address)
+    records = index['records']
+    
+    # An exact name and address match is the best possible score, so it wins outright
+    exact_idx = index['names'].get(nym_name)
+    if exact_idx is not None and score_match(nym_name, nym_tokens, nym_address, nym_street, records[exact_idx]) == MAX_MATCH_SCORE:
+        return exact_idx
+    
+    # Only restaurants sharing a name token can match; score them in list order
+    candidates = sorted(set().union(*(index['tokens'].get(token, ()) for token in nym_tokens)))
+    
     best_match_idx = None
     best_match_score = 0
     
-    for idx, nyt_restaurant in enumerate(nyt_restaurants):
-        nyt_name = normalize_name(nyt_restaurant.get('name', ''))
-        nyt_address = normalize_address(nyt_restaurant.get('formatted_address', ''))
-        
-        # Name match (exact or fuzzy)
-        name_match = False
-        if nym_name == nyt_name:
-            name_match = True
-        elif nym_name in nyt_name or nyt_name in nym_name:
-            # Partial match
-            name_match = True
-        
-        if not name_match:
-            continue
-        
-        # Address match (if both have addresses)
-        address_match = False
-        if nym_address and nyt_address:
-            # Check if addresses are similar
-            if nym_address == nyt_address:
-                address_match = True
-            elif nym_address in nyt_address or nyt_address in nym_address:
-                # Partial match
-                address_match = True
-            # Extract street number and name for better matching
-            nym_street_match = re.search(r'(\d+)\s+([\w\s]+)', nym_address)
-            nyt_street_match = re.search(r'(\d+)\s+([\w\s]+)', nyt_address)
-            if nym_street_match and nyt_street_match:
-                if (nym_street_match.group(1) == nyt_street_match.group(1) and
-                    nym_street_match.group(2).strip()[:10] == nyt_street_match.group(2).strip()[:10]):
-                    address_match = True
-        elif not nym_address or not nyt_address:
-            # If one doesn't have address, still consider it a match if name matches well
-            address_match = True
-        
-        # Calculate match score
-        score = 0
-        if name_match:
-            score += 10
-            if nym_name == nyt_name:
-                score += 5  # Exact name match
-        if address_match:
-            score += 10
-            if nym_address == nyt_address:
-                score += 5  # Exact address match
-        
+    for idx in candidates:
+        score = score_match(nym_name, nym_tokens, nym_address, nym_street, records[idx])
         if score > best_match_score:
             best_match_score = score
             best_match_idx = idx
@@ -113,22 +174,23 @@ def find_matching_restaurant(nym_restaurant: Dict, nyt_restaurants: List[Dict])
 
 
 def merge_restaurant_lists(nyt_restaurants: List[Dict], nym_restaurants: List[Dict]) -> List[Dict]:
-    """Merge NYT and NYM restaurant lists."""
+    """Merge NYT and NYM restaurant lists. The NYT restaurant dicts are updated in place."""
     
-    merged = []
+    merged = list(nyt_restaurants)
     matched_nym_indices = set()
     
     # First, process all NYT restaurants and add NYT source
-    for nyt_restaurant in nyt_restaurants:
-        restaurant = nyt_restaurant.copy()
+    for restaurant in merged:
         restaurant['sources'] = ['NYT']
         restaurant['nyt_rank'] = restaurant.get('rank')
         # Keep rank for backward compatibility
-        merged.append(restaurant)
+    
+    # Normalize everything once; the index is kept in sync as entries change below
+    index = build_match_index(merged)
     
     # Then, try to match NYM restaurants with existing ones
     for nym_restaurant in nym_restaurants:
-        match_idx = find_matching_restaurant(nym_restaurant, merged)
+        match_idx = find_matching_restaurant(nym_restaurant, index)
         
         if match_idx is not None:
             # Found a match - add NYM source to existing restaurant
@@ -137,6 +199,8 @@ def merge_restaurant_lists(nyt_restaurants: List[Dict], nym_restaurants: List[Di
             # Update address if NYM has one and NYT doesn't
             if not merged[match_idx].get('formatted_address') and nym_restaurant.get('address'):
                 merged[match_idx]['formatted_address'] = nym_restaurant['address']
+                index['records'][match_idx] = (index['records'][match_idx][:2] +
+                                               index_record(normalize_address(nym_restaurant['address'])))
             # Update website if NYM has one and NYT doesn't
             if not merged[match_idx].get('website') and nym_restaurant.get('website'):
                 merged[match_idx]['website'] = nym_restaurant['website']
@@ -158,13 +222,15 @@ def merge_restaurant_lists(nyt_restaurants: List[Dict], nym_restaurants: List[Di
                 'image_url': None,
             }
             merged.append(new_restaurant)
+            index_restaurant(index, new_restaurant)
     
     # Calculate combined_order for all restaurants
     for restaurant in merged:
-        if 'NYT' in restaurant.get('sources', []):
+        sources = restaurant.get('sources', [])
+        if 'NYT' in sources:
             # NYT restaurants use their NYT rank
             restaurant['combined_order'] = restaurant.get('nyt_rank', 999)
-        elif 'NYM' in restaurant.get('sources', []):
+        elif 'NYM' in sources:
             # NYM-only restaurants use 100 + their NYM rank
             restaurant['combined_order'] = 100 + restaurant.get('nym_rank', 999)
         else:
@@ -172,7 +238,7 @@ def merge_restaurant_lists(nyt_restaurants: List[Dict], nym_restaurants: List[Di
             restaurant['combined_order'] = 999
     
     # Sort by combined_order
-    merged.sort(key=lambda x: x.get('combined_order', 999))
+    merged.sort(key=itemgetter('combined_order'))
     
     return merged
 
@@ -195,12 +261,12 @@ def main():
         return
     
     # Load NYT restaurants
-    with open(nyt_file, 'r', encoding='utf-8') as f:
-        nyt_restaurants = json.load(f)
+    with open(nyt_file, 'rb') as f:
+        nyt_restaurants = orjson.loads(f.read())
     
     # Load NYM restaurants
-    with open(nym_file, 'r', encoding='utf-8') as f:
-        nym_restaurants = json.load(f)
+    with open(nym_file, 'rb') as f:
+        nym_restaurants = orjson.loads(f.read())
     
     print(f"Loaded {len(nyt_restaurants)} NYT restaurants")
     print(f"Loaded {len(nym_restaurants)} NYM restaurants")
@@ -219,9 +285,9 @@ def main():
     print(f"  NYM only: {nym_only}")
     print(f"  Both: {both}")
     
-    # Save merged data
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(merged_restaurants, f, indent=2, ensure_ascii=False)
+    # Save merged data (indented - tracked in the repo, so regenerations stay diffable)
+    with open(output_file, 'wb') as f:
+        f.write(orjson.dumps(merged_restaurants, option=orjson.OPT_INDENT_2))
     
     print(f"\nSaved merged data to: {output_file}")
     
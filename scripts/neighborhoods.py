@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+NYC neighborhood data shared by the data cleaning scripts.
+Provides approximate coordinates and a matcher for neighborhood mentions.
+"""
+
+from typing import Optional
+
+
+# Approximate coordinates for NYC neighborhoods
+NEIGHBORHOOD_COORDS = {
+    "Manhattan": (40.7831, -73.9712),
+    "Brooklyn": (40.6782, -73.9442),
+    "Queens": (40.7282, -73.7949),
+    "Bronx": (40.8448, -73.8648),
+    "Staten Island": (40.5795, -74.1502),
+    "West Village": (40.7358, -74.0036),
+    "East Village": (40.7282, -73.9857),
+    "Greenwich Village": (40.7336, -74.0027),
+    "SoHo": (40.7231, -74.0026),
+    "NoMad": (40.7484, -73.9857),
+    "Midtown": (40.7549, -73.9840),
+    "Downtown": (40.7074, -74.0113),
+    "Upper West Side": (40.7870, -73.9754),
+    "Upper East Side": (40.7736, -73.9566),
+    "Chinatown": (40.7158, -73.9970),
+    "Little Italy": (40.7189, -73.9969),
+    "Koreatown": (40.7505, -73.9934),
+    "Harlem": (40.8075, -73.9626),
+    "Chelsea": (40.7505, -74.0018),
+    "Greenpoint": (40.7336, -73.9507),
+    "Williamsburg": (40.7081, -73.9571),
+    "Fort Greene": (40.6892, -73.9742),
+    "Prospect Heights": (40.6746, -73.9708),
+    "Bushwick": (40.6944, -73.9212),
+    "Red Hook": (40.6754, -74.0077),
+    "Sunset Park": (40.6455, -74.0124),
+    "Bensonhurst": (40.6018, -73.9944),
+    "Flushing": (40.7675, -73.8331),
+    "Jackson Heights": (40.7556, -73.8854),
+    "Elmhurst": (40.7365, -73.8776),
+    "Astoria": (40.7698, -73.9215),
+    "Long Island City": (40.7448, -73.9485),
+    "Bedford-Stuyvesant": (40.6834, -73.9389),
+    "Crown Heights": (40.6681, -73.9448),
+    "Park Slope": (40.6612, -73.9986),
+    "Bay Ridge": (40.6254, -74.0304),
+    "Sheepshead Bay": (40.5868, -73.9543),
+    "JFK": (40.6413, -73.7781),
+    "Times Square": (40.7580, -73.9855),
+    "Financial District": (40.7074, -74.0113),
+}
+
+
+# Neighborhood names in priority order (earlier entries win when several are mentioned)
+NEIGHBORHOODS = list(NEIGHBORHOOD_COORDS)
+
+# Texts shorter than the shortest name ("JFK") cannot mention any neighborhood
+MIN_NEIGHBORHOOD_LENGTH = min(len(name) for name in NEIGHBORHOODS)
+
+# Lowercased (key, original) pairs in priority order, built once for case-insensitive matching
+_NEIGHBORHOODS_LC = tuple((name.lower(), name) for name in NEIGHBORHOODS)
+
+
+def find_neighborhood(*texts: str) -> Optional[str]:
+    """Return the highest-priority neighborhood mentioned in any of the (lowercased) texts."""
+    texts = [text for text in texts if len(text) >= MIN_NEIGHBORHOOD_LENGTH]
+    for neighborhood_lc, neighborhood in _NEIGHBORHOODS_LC:
+        for text in texts:
+            if neighborhood_lc in text:
+                return neighborhood
+    
+    return None
@@ -4,34 +4,105 @@ Parse HTML dump from Google Maps list to extract restaurant data.
 Extracts: rank, name, rating, review count, price range, cuisine, description, image URL
 """
 
-import json
+import orjson
 import re
-from bs4 import BeautifulSoup
+from concurrent.futures import ProcessPoolExecutor
+from lxml.etree import HTMLPullParser, tostring
+from lxml.html import fragment_fromstring
 from pathlib import Path
 
+# "1. Semma" -> rank 1, name "Semma"
+_RE_RANK = re.compile(r'^(\d+)\.\s*(.+)$')
+# "4.2 stars 1,431 Reviews"
+_RE_RATING = re.compile(r'(\d+\.\d+)\s+stars\s+([\d,]+)\s+Reviews')
 
-def parse_restaurant_data(html_file_path: str) -> list:
-    """Parse HTML file and extract restaurant data."""
+
+# Restaurant entries are divs with class "m6QErb XiKgde"
+RESTAURANT_DIV_CLASSES = ['m6QErb', 'XiKgde']
+# The dump is fed to the parser in chunks so only one entry's subtree is held at a time
+READ_CHUNK_SIZE = 64 * 1024
+# Extraction takes well under a millisecond per entry, so worker processes only pay
+# for their startup and pickling on very large dumps
+PARALLEL_MIN_ENTRIES = 2000
+PARALLEL_CHUNK_SIZE = 64
+
+# Classes identifying each field inside an entry (exact class lists, or a single class)
+HEADLINE_CLASSES = ['fontHeadlineSmall', 'rZF81c']
+DESCRIPTION_CLASSES = ['u5DVOd', 'fontBodyMedium', 'SwaGS']
+PRICE_CUISINE_CLASS = 'IIrLbb'
+RATING_CLASS = 'ZkP5Je'
+IMAGE_CLASS = 'WkIe8'
+
+
+def get_text(element) -> str:
+    """Concatenate the element's text fragments, each stripped of surrounding whitespace."""
+    return ''.join(text.strip() for text in element.itertext())
+
+
+def iter_restaurant_divs(html_file_path: str):
+    """Stream-parse the HTML file, yielding each restaurant div once it is complete."""
+    
+    parser = HTMLPullParser(events=('end',), tag='div')
+    
+    def complete_divs():
+        for _, elem in parser.read_events():
+            if (elem.get('class') or '').split() != RESTAURANT_DIV_CLASSES:
+                continue
+            yield elem
+            # Drop the parsed entry and everything before it
+            elem.clear()
+            while elem.getprevious() is not None:
+                del elem.getparent()[0]
     
     with open(html_file_path, 'r', encoding='utf-8') as f:
-        html_content = f.read()
+        for chunk in iter(lambda: f.read(READ_CHUNK_SIZE), ''):
+            parser.feed(chunk)
+            yield from complete_divs()
+    parser.close()
+    yield from complete_divs()
+
+
+def extract_restaurant_or_report(div) -> dict:
+    """Extract a restaurant, printing (and skipping) entries that fail to parse."""
+    try:
+        return extract_restaurant_from_div(div)
+    except Exception as e:
+        print(f"Error parsing restaurant div: {e}")
+        return {}
+
+
+def extract_restaurant_from_html(div_html: bytes) -> dict:
+    """Re-parse a serialized restaurant div and extract it (runs in a worker process)."""
+    return extract_restaurant_or_report(fragment_fromstring(div_html))
+
+
+def parse_restaurant_data(html_file_path: str) -> list:
+    """Parse HTML file and extract restaurant data."""
     
-    soup = BeautifulSoup(html_content, 'html.parser')
     restaurants = []
+    entry_count = 0
     
     # Find all restaurant entries - they're in divs with class "m6QErb XiKgde"
-    restaurant_divs = soup.find_all('div', class_='m6QErb XiKgde')
-    
-    print(f"Found {len(restaurant_divs)} restaurant entries")
-    
+    restaurant_divs = iter_restaurant_divs(html_file_path)
     for div in restaurant_divs:
-        try:
-            restaurant = extract_restaurant_from_div(div)
-            if restaurant:
-                restaurants.append(restaurant)
-        except Exception as e:
-            print(f"Error parsing restaurant div: {e}")
-            continue
+        entry_count += 1
+        restaurant = extract_restaurant_or_report(div)
+        if restaurant:
+            restaurants.append(restaurant)
+        if entry_count >= PARALLEL_MIN_ENTRIES:
+            break
+    
+    # Very large dump - extract the remaining entries across all cores
+    if entry_count >= PARALLEL_MIN_ENTRIES:
+        div_htmls = (tostring(div, method='html', with_tail=False) for div in restaurant_divs)
+        with ProcessPoolExecutor() as executor:
+            for restaurant in executor.map(extract_restaurant_from_html, div_htmls,
+                                           chunksize=PARALLEL_CHUNK_SIZE):
+                entry_count += 1
+                if restaurant:
+                    restaurants.append(restaurant)
+    
+    print(f"Found {entry_count} restaurant entries")
     
     return restaurants
 
@@ -41,12 +112,32 @@ def extract_restaurant_from_div(div) -> dict:
     
     restaurant = {}
     
+    # Collect the field elements in a single pass over the entry's subtree
+    headline = rating_span = description_div = img_tag = None
+    price_cuisine_divs = []
+    for elem in div.iterdescendants('div', 'span', 'img'):
+        classes = elem.get('class')
+        if not classes:
+            continue
+        classes = classes.split()
+        if elem.tag == 'div':
+            if headline is None and classes == HEADLINE_CLASSES:
+                headline = elem
+            elif description_div is None and classes == DESCRIPTION_CLASSES:
+                description_div = elem
+            elif PRICE_CUISINE_CLASS in classes:
+                price_cuisine_divs.append(elem)
+        elif elem.tag == 'span':
+            if rating_span is None and RATING_CLASS in classes:
+                rating_span = elem
+        elif img_tag is None and IMAGE_CLASS in classes:
+            img_tag = elem
+    
     # Extract rank and name from headline
-    headline = div.find('div', class_='fontHeadlineSmall rZF81c')
-    if headline:
-        headline_text = headline.get_text(strip=True)
+    if headline is not None:
+        headline_text = get_text(headline)
         # Extract rank number (e.g., "1. Semma" -> rank: 1, name: "Semma")
-        rank_match = re.match(r'^(\d+)\.\s*(.+)$', headline_text)
+        rank_match = _RE_RANK.match(headline_text)
         if rank_match:
             restaurant['rank'] = int(rank_match.group(1))
             restaurant['name'] = rank_match.group(2)
@@ -55,29 +146,27 @@ def extract_restaurant_from_div(div) -> dict:
             restaurant['rank'] = None
     
     # Extract rating and review count
-    rating_span = div.find('span', class_='ZkP5Je')
-    if rating_span:
+    if rating_span is not None:
         aria_label = rating_span.get('aria-label', '')
         # Parse "4.2 stars 1,431 Reviews"
-        rating_match = re.search(r'(\d+\.\d+)\s+stars\s+([\d,]+)\s+Reviews', aria_label)
+        rating_match = _RE_RATING.search(aria_label)
         if rating_match:
             restaurant['rating'] = float(rating_match.group(1))
             restaurant['review_count'] = int(rating_match.group(2).replace(',', ''))
     
     # Extract price range and cuisine
     # Look for the IIrLbb div that contains price and cuisine (not rating)
-    price_cuisine_divs = div.find_all('div', class_='IIrLbb')
     for price_cuisine_div in price_cuisine_divs:
-        spans = price_cuisine_div.find_all('span')
+        spans = list(price_cuisine_div.iter('span'))
         if len(spans) >= 2:
-            first_span_text = spans[0].get_text(strip=True)
+            first_span_text = get_text(spans[0])
             # Check if this is the price/cuisine div (starts with $)
             if first_span_text.startswith('$'):
                 restaurant['price_range'] = first_span_text
                 # Find cuisine text (skip bullet separator)
                 if len(spans) >= 2:
                     # The cuisine is in the second span, after the bullet
-                    second_span_text = spans[1].get_text(strip=True)
+                    second_span_text = get_text(spans[1])
                     # Remove the bullet and clean up whitespace
                     cuisine_text = second_span_text.replace('·', '').strip()
                     if cuisine_text:
@@ -85,15 +174,13 @@ def extract_restaurant_from_div(div) -> dict:
                 break
     
     # Extract description
-    description_div = div.find('div', class_='u5DVOd fontBodyMedium SwaGS')
-    if description_div:
-        description_span = description_div.find('span')
-        if description_span:
-            restaurant['description'] = description_span.get_text(strip=True)
+    if description_div is not None:
+        description_span = next(description_div.iter('span'), None)
+        if description_span is not None:
+            restaurant['description'] = get_text(description_span)
     
     # Extract image URL
-    img_tag = div.find('img', class_='WkIe8')
-    if img_tag:
+    if img_tag is not None:
         restaurant['image_url'] = img_tag.get('src', '')
     
     return restaurant
@@ -118,9 +205,9 @@ def main():
     # Sort by rank
     restaurants.sort(key=lambda x: x.get('rank', 999))
     
-    # Save to JSON
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(restaurants, f, indent=2, ensure_ascii=False)
+    # Save to JSON (indented - tracked in the repo, so regenerations stay diffable)
+    with open(output_file, 'wb') as f:
+        f.write(orjson.dumps(restaurants, option=orjson.OPT_INDENT_2))
     
     print(f"Saved parsed data to: {output_file}")
     
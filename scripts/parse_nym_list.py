@@ -4,34 +4,55 @@ Parse NYM restaurant list from text file.
 Extracts restaurant name, address, and website from the formatted text.
 """
 
-import json
 import re
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List, Optional
+import orjson
 
+# Descriptor verbs that follow the restaurant name in a title line ("X Is Y", "X's Y",
+# "X Has Y", ...). Order matters: name extraction tries them in this order and the
+# first one that matches wins.
+_DESCRIPTOR_VERBS = ('Is', "'s", 'Has', 'Deserves', 'Adds', 'Brought', 'Overcomes',
+                     'Feels', 'Leads', 'Sits', 'Makes', 'Just')
+_NAME_PATTERNS = [
+    re.compile(r'^(.+?)' + ('' if verb.startswith("'") else r'\s+') + re.escape(verb) + r'\s+', re.IGNORECASE)
+    for verb in _DESCRIPTOR_VERBS
+]
 
+# Address at the end of the text: number + street name + optional neighborhood, ending
+# with St/Ave/etc. The address should start with a number followed by space/letter (not $
+# or other punctuation); hyphenated Queens numbers (e.g., "24-19") only for St/Ave.
+_STREET_TOKENS = ('St', 'Ave', 'Blvd', 'Pl', 'Rd', 'Dr', 'Way')
+_HYPHENATED_STREET_TOKENS = ('St', 'Ave')
+_ADDRESS_RE = re.compile(
+    r'(\d+\s+[A-Z][\w\s\.,\-\']*(?:' + '|'.join(_STREET_TOKENS) + r')[^;]*'
+    r'|\d+-\d+\s+[\w\s\.,\-\']+(?:' + '|'.join(_HYPHENATED_STREET_TOKENS) + r')[^;]*'
+    r'|Multiple locations)$'
+)
+
+# Title line markers: descriptor verbs as plain, case-sensitive substrings (the short
+# ones need a trailing space so "Island" or "Hash" don't count)
+_TITLE_MARKERS = tuple(verb + ' ' if len(verb) <= 3 else verb for verb in _DESCRIPTOR_VERBS)
+
+_PHONE_RE = re.compile(r'^\d+[-.\s]?\d+[-.\s]?\d+')
+_WS_RE = re.compile(r'\s+')
+
+
+def has_title_marker(line: str) -> bool:
+    """Check whether a line contains a descriptor verb (common "Is " / "'s " titles match on the first tests)."""
+    for marker in _TITLE_MARKERS:
+        if marker in line:
+            return True
+    return False
+
+
+@lru_cache(maxsize=1024)
 def extract_restaurant_name(title_line: str) -> Optional[str]:
     """Extract restaurant name from title line (e.g., 'Thai Diner Is a Sexy Mess' -> 'Thai Diner')."""
-    # Common patterns: "X Is Y", "X's Y", "X Has Y", "X Adds Y", etc.
     # Split on common verbs that come after the restaurant name
-    patterns = [
-        r'^(.+?)\s+Is\s+',
-        r'^(.+?)\'s\s+',
-        r'^(.+?)\s+Has\s+',
-        r'^(.+?)\s+Deserves\s+',
-        r'^(.+?)\s+Adds\s+',
-        r'^(.+?)\s+Brought\s+',
-        r'^(.+?)\s+Overcomes\s+',
-        r'^(.+?)\s+Feels\s+',
-        r'^(.+?)\s+Leads\s+',
-        r'^(.+?)\s+Is\s+',
-        r'^(.+?)\s+Sits\s+',
-        r'^(.+?)\s+Makes\s+',
-        r'^(.+?)\s+Just\s+',
-    ]
-    
-    for pattern in patterns:
-        match = re.match(pattern, title_line, re.IGNORECASE)
+    for pattern in _NAME_PATTERNS:
+        match = pattern.match(title_line)
         if match:
             name = match.group(1).strip()
             # Clean up common prefixes/suffixes
@@ -42,8 +63,9 @@ def extract_restaurant_name(title_line: str) -> Optional[str]:
     return title_line.strip()
 
 
-def extract_address_and_website(text: str) -> tuple[Optional[str], Optional[str]]:
-    """Extract address and website from the end of a paragraph."""
+@lru_cache(maxsize=1024)
+def extract_address_and_website(text: str) -> tuple[Optional[str], Optional[str], Optional[int]]:
+    """Extract address, website, and the address's start index in text from the end of a paragraph."""
     # Pattern: address ends with semicolon, then website or phone
     # Examples:
     # "129 E. 60th St.; lvdnyc.com"
@@ -58,161 +80,112 @@ def extract_address_and_website(text: str) -> tuple[Optional[str], Optional[str]
     # First, try to find semicolon near the end
     semicolon_pos = text.rfind(';')
     if semicolon_pos == -1:
-        return None, None
+        return None, None, None
     
     # Extract everything after the semicolon (website/phone)
     after_semicolon = text[semicolon_pos + 1:].strip()
     if not after_semicolon:
-        return None, None
-    
-    # Extract everything before the semicolon
-    before_semicolon = text[:semicolon_pos].strip()
-    
-    # Now find the address pattern in the text before the semicolon
-    # Address patterns: number + street name + optional neighborhood
-    # Address should start with a number followed by space/letter (not $ or other punctuation)
-    # and end with St/Ave/etc.
-    address_patterns = [
-        r'(\d+\s+[A-Z][\w\s\.,\-\']*St\.?[^;]*)$',  # Street - starts with number, space, then capital letter
-        r'(\d+\s+[A-Z][\w\s\.,\-\']*Ave\.?[^;]*)$',  # Avenue
-        r'(\d+\s+[A-Z][\w\s\.,\-\']*Blvd\.?[^;]*)$',  # Boulevard
-        r'(\d+\s+[A-Z][\w\s\.,\-\']*Pl\.?[^;]*)$',  # Place
-        r'(\d+\s+[A-Z][\w\s\.,\-\']*Rd\.?[^;]*)$',  # Road
-        r'(\d+\s+[A-Z][\w\s\.,\-\']*Dr\.?[^;]*)$',  # Drive
-        r'(\d+\s+[A-Z][\w\s\.,\-\']*Way[^;]*)$',  # Way
-        r'(\d+-\d+\s+[\w\s\.,\-\']+St\.?[^;]*)$',  # Street with dash in number (e.g., "24-19")
-        r'(\d+-\d+\s+[\w\s\.,\-\']+Ave\.?[^;]*)$',  # Avenue with dash
-        r'(Multiple locations)$',  # Multiple locations
-    ]
+        return None, None, None
     
-    # Find the address at the end of the before_semicolon text
-    # We want the address pattern that's closest to the semicolon
-    best_match = None
-    best_match_end = -1
+    # Extract everything before the semicolon (not left-stripped, so indices line up with text)
+    before_semicolon = text[:semicolon_pos].rstrip()
     
-    for pattern in address_patterns:
-        # Find all matches and take the one closest to the semicolon
-        for match in re.finditer(pattern, before_semicolon):
-            match_end = match.end()
-            match_text = match.group(1).strip()
-            # Verify it's a valid address (starts with number or "Multiple", contains street type)
-            if (match_text.startswith(('0', '1', '2', '3', '4', '5', '6', '7', '8', '9', 'Multiple')) and
-                ('St' in match_text or 'Ave' in match_text or 'Blvd' in match_text or 
-                 'Pl' in match_text or 'Rd' in match_text or 'Dr' in match_text or 
-                 'Way' in match_text or match_text.startswith('Multiple'))):
-                if match_end > best_match_end:
-                    best_match_end = match_end
-                    best_match = match_text
+    # Now find the address pattern at the end of the text before the semicolon
+    # (one alternation, so the leftmost - i.e. longest - address wins)
+    address_match = _ADDRESS_RE.search(before_semicolon)
+    best_match = address_match.group(1).strip() if address_match else None
     
     if best_match:
         address = best_match.strip()
-        address = re.sub(r'\s+', ' ', address)  # Normalize whitespace
+        address = _WS_RE.sub(' ', address)  # Normalize whitespace
         
-        # Check if website_or_phone is a phone number
-        if re.match(r'^\d+[-.\s]?\d+[-.\s]?\d+', after_semicolon):
-            return address, None
+        # Check if website_or_phone is a phone number (cheap prefilter: _PHONE_RE requires a leading digit)
+        if after_semicolon[:1].isdigit() and _PHONE_RE.match(after_semicolon):
+            return address, None, address_match.start()
         else:
             # It's a website
             website = after_semicolon
             if not website.startswith('http'):
                 if '.' in website:
                     website = 'https://' + website
-            return address, website
+            return address, website, address_match.start()
     
-    return None, None
+    return None, None, None
 
 
 def parse_nym_list(file_path: str) -> List[Dict]:
     """Parse NYM list text file and extract restaurant data."""
     
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    lines = content.split('\n')
     restaurants = []
     current_restaurant = None
     nym_rank = 0
     
-    i = 0
-    while i < len(lines):
-        line = lines[i].strip()
-        
-        # Skip empty lines
-        if not line:
-            i += 1
-            continue
-        
-        # Check if this is a title line (restaurant name with descriptor)
-        # Title lines are typically short and don't start with common sentence starters
-        if (len(line) < 100 and 
-            not line[0].islower() and 
-            ('Is ' in line or "'s " in line or 'Has ' in line or 
-             'Deserves' in line or 'Adds' in line or 'Brought' in line or
-             'Overcomes' in line or 'Feels' in line or 'Leads' in line or
-             'Sits' in line or 'Makes' in line or 'Just' in line)):
-            
-            # Extract restaurant name
-            name = extract_restaurant_name(line)
-            
-            # Start new restaurant entry
-            if current_restaurant:
-                restaurants.append(current_restaurant)
-            
-            nym_rank += 1
-            current_restaurant = {
-                'nym_rank': nym_rank,
-                'name': name,
-                'title_line': line,
-                'description': '',
-                'address': None,
-                'website': None
-            }
+    with open(file_path, 'r', encoding='utf-8') as f:
+        # Read lines lazily; the description loop below pulls from the same iterator
+        lines = iter(f)
+        for line in lines:
+            line = line.strip()
             
-            # Look ahead for description and address/website
-            description_lines = []
-            i += 1
-            full_text = ''
+            # Skip empty lines
+            if not line:
+                continue
             
-            # Collect description lines until we find address/website pattern
-            while i < len(lines):
-                next_line = lines[i].strip()
-                if not next_line:
-                    i += 1
-                    continue
+            # Check if this is a title line (restaurant name with descriptor)
+            # Title lines are typically short and don't start with common sentence starters
+            if len(line) < 100 and not line[0].islower() and has_title_marker(line):
                 
-                full_text += ' ' + next_line
+                # Extract restaurant name
+                name = extract_restaurant_name(line)
                 
-                # Check if this line (or accumulated text) contains address pattern
-                address, website = extract_address_and_website(full_text.strip())
-                if address:
-                    current_restaurant['address'] = address
-                    current_restaurant['website'] = website
-                    # Remove address and website from description
-                    # Find where the address starts in the text - look for the pattern before semicolon
-                    # We need to find the position where the address pattern begins
-                    # Try to find the last occurrence of a pattern that matches our address
-                    address_match = re.search(r'(' + re.escape(address.split(',')[0].strip()) + r'[^;]*);', full_text)
-                    if address_match:
-                        description_text = full_text[:address_match.start()].strip()
+                # Start new restaurant entry
+                if current_restaurant:
+                    restaurants.append(current_restaurant)
+                
+                nym_rank += 1
+                current_restaurant = {
+                    'nym_rank': nym_rank,
+                    'name': name,
+                    'title_line': line,
+                    'description': '',
+                    'address': None,
+                    'website': None
+                }
+                
+                # Look ahead for description and address/website
+                description_lines = []
+                full_text = ''
+                
+                # Collect description lines until we find address/website pattern
+                # (the address line itself is consumed here too)
+                for next_line in lines:
+                    next_line = next_line.strip()
+                    if not next_line:
+                        continue
+                    
+                    # The address is anchored on the last semicolon, so the result can only change
+                    # when this line adds a semicolon or text follows a trailing one
+                    needs_check = ';' in next_line or full_text.endswith(';')
+                    full_text += ' ' + next_line
+                    
+                    # Check if this line (or accumulated text) contains address pattern
+                    address = None
+                    if needs_check:
+                        text = full_text.strip()
+                        address, website, address_start = extract_address_and_website(text)
+                    if address:
+                        current_restaurant['address'] = address
+                        current_restaurant['website'] = website
+                        # Remove address and website from description - keep what precedes the address
+                        description_text = text[:address_start].strip()
                         if description_text:
                             description_lines = [description_text]
-                    else:
-                        # Fallback: just remove the address from the end
-                        address_pos = full_text.rfind(address.split(',')[0].strip())
-                        if address_pos >= 0:
-                            description_text = full_text[:address_pos].strip()
-                            if description_text:
-                                description_lines = [description_text]
-                    break
+                        break
+                    
+                    description_lines.append(next_line)
                 
-                description_lines.append(next_line)
-                i += 1
-            
-            # Join description lines
-            if description_lines:
-                current_restaurant['description'] = ' '.join(description_lines)
-        
-        i += 1
+                # Join description lines
+                if description_lines:
+                    current_restaurant['description'] = ' '.join(description_lines)
     
     # Don't forget the last restaurant
     if current_restaurant:
@@ -237,8 +210,8 @@ def main():
     print(f"Successfully parsed {len(restaurants)} restaurants")
     
     # Save to JSON
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(restaurants, f, indent=2, ensure_ascii=False)
+    with open(output_file, 'wb') as f:
+        f.write(orjson.dumps(restaurants, option=orjson.OPT_INDENT_2))
     
     print(f"Saved parsed data to: {output_file}")
     
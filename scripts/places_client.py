@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Google Places API (New) client shared by the enrichment and update scripts.
+Provides the API configuration, a pooled HTTP session with backoff retries, the on-disk
+response cache, request pacing, and a worker pool that cancels queued requests on interrupt.
+"""
+
+import atexit
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional, Sequence, Tuple
+import requests
+from requests.adapters import HTTPAdapter
+from diskcache import Cache
+from urllib3.util.retry import Retry
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv('.env.local')
+load_dotenv()  # Also try default .env file
+
+# Google Places API (New) configuration
+GOOGLE_PLACES_API_KEY = os.getenv('GOOGLE_PLACES_API_KEY')
+BASE_URL = 'https://places.googleapis.com/v1'
+
+# Minimum delay between Places API requests - Google Places API has quotas
+REQUEST_INTERVAL = 0.1  # 100ms, i.e. at most 10 requests per second across all workers
+MAX_WORKERS = 10  # Concurrent request threads
+PROGRESS_INTERVAL = 10  # Print progress every N completed items
+REQUEST_TIMEOUT = 10  # Seconds
+
+# Exponential backoff on rate limiting and transient server errors,
+# honoring Google's Retry-After header. Text Search is a POST, so POST must be retried too.
+PLACES_RETRY = Retry(
+    total=5,
+    backoff_factor=0.5,
+    status_forcelist=[429, 500, 502, 503, 504],
+    allowed_methods=None,
+    respect_retry_after_header=True,
+)
+
+# Shared HTTP session so worker threads reuse pooled keep-alive connections
+# (one TCP + TLS handshake per connection instead of per request), with
+# backoff retries for rate limiting and transient server errors
+session = requests.Session()
+session.mount('https://', HTTPAdapter(
+    pool_connections=1,
+    pool_maxsize=MAX_WORKERS,
+    max_retries=PLACES_RETRY
+))
+if GOOGLE_PLACES_API_KEY:
+    session.headers['X-Goog-Api-Key'] = GOOGLE_PLACES_API_KEY
+atexit.register(session.close)
+
+# On-disk cache of Places API responses, so re-runs skip already-fetched restaurants.
+# NYT list lookups are redone whenever the list is re-enriched, so they expire monthly;
+# NYM-only lookups are one-off matches that are kept for a year.
+CACHE_DIR = Path(__file__).parent.parent / 'data' / '.places_cache'
+NYT_CACHE_EXPIRE = 30 * 24 * 60 * 60  # 30 days, in seconds
+NYM_CACHE_EXPIRE = 365 * 24 * 60 * 60  # 1 year, in seconds
+places_cache = Cache(str(CACHE_DIR))
+
+_rate_limit_lock = threading.Lock()
+_next_request_time = 0.0
+
+
+def wait_for_rate_limit():
+    """Block until this thread's request slot, keeping requests REQUEST_INTERVAL apart."""
+    global _next_request_time
+    with _rate_limit_lock:
+        now = time.monotonic()
+        slot = max(now, _next_request_time)
+        _next_request_time = slot + REQUEST_INTERVAL
+    if slot > now:
+        time.sleep(slot - now)
+
+
+def cached(key, fetch: Callable[[], Any], expire: int) -> Any:
+    """Return the cached response for key, or call fetch and cache a non-None result for expire seconds."""
+    value = places_cache.get(key)
+    if value is None:
+        value = fetch()
+        if value is not None:
+            places_cache.set(key, value, expire=expire)
+    return value
+
+
+def coerce_rating(rating) -> Optional[float]:
+    """Places ratings come back either as a number or as {'value': ...}."""
+    if isinstance(rating, dict):
+        return rating.get('value')
+    if isinstance(rating, (int, float)):
+        return rating
+    return None
+
+
+@contextmanager
+def run_rate_limited(fn: Callable, items: Sequence) -> Iterator[Iterator[Tuple[int, Any]]]:
+    """Run fn over items on the worker pool, yielding an iterator of (index, result) as each completes."""
+    # Requests are I/O-bound, so threads suffice; fn paces itself with wait_for_rate_limit
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        futures = {executor.submit(fn, item): index for index, item in enumerate(items)}
+        
+        def completed() -> Iterator[Tuple[int, Any]]:
+            for done, future in enumerate(as_completed(futures), start=1):
+                yield futures[future], future.result()
+                if done % PROGRESS_INTERVAL == 0 or done == len(futures):
+                    print(f"📊 Progress: {done}/{len(futures)}", flush=True)
+        
+        try:
+            yield completed()
+        except BaseException:
+            # Ctrl-C or a failed worker, raised either while waiting or in the caller's loop:
+            # drop the queued calls instead of letting the executor run (and bill) every one
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
@@ -4,21 +4,26 @@ Update restaurant data using stored place_ids.
 This script refreshes dynamic data (hours, phone, website, rating) using the new Places API.
 """
 
-import json
 import os
 import time
 from pathlib import Path
 from typing import Dict, List, Optional
+import orjson
 import requests
-from dotenv import load_dotenv
+from places_client import (
+    GOOGLE_PLACES_API_KEY, BASE_URL, REQUEST_TIMEOUT,
+    coerce_rating, run_rate_limited, session, wait_for_rate_limit,
+)
 
-# Load environment variables
-load_dotenv('.env.local')
-load_dotenv()  # Also try default .env file
+# Field mask for place details (New API format) - only the fields written back
+# by update_restaurant_data, including editorialSummary
+PLACE_DETAILS_FIELD_MASK = "formattedAddress,location,regularOpeningHours,websiteUri,googleMapsUri,nationalPhoneNumber,rating,userRatingCount,editorialSummary"
 
-# Google Places API (New) configuration
-GOOGLE_PLACES_API_KEY = os.getenv('GOOGLE_PLACES_API_KEY')
-BASE_URL = 'https://places.googleapis.com/v1'
+# Per-request headers for Place Details, built once (the shared session only carries the API key)
+PLACE_DETAILS_HEADERS = {
+    'Accept-Encoding': 'gzip',
+    'X-Goog-FieldMask': PLACE_DETAILS_FIELD_MASK
+}
 
 
 def get_place_details(place_id: str) -> Optional[Dict]:
@@ -27,16 +32,10 @@ def get_place_details(place_id: str) -> Optional[Dict]:
     if not GOOGLE_PLACES_API_KEY:
         return None
     
-    # Field mask for place details (New API format) - include editorialSummary
-    field_mask = "id,displayName,formattedAddress,location,regularOpeningHours,websiteUri,googleMapsUri,nationalPhoneNumber,rating,userRatingCount,editorialSummary"
-    
-    headers = {
-        'X-Goog-Api-Key': GOOGLE_PLACES_API_KEY,
-        'X-Goog-FieldMask': field_mask
-    }
-    
     try:
-        response = requests.get(f"{BASE_URL}/places/{place_id}", headers=headers)
+        wait_for_rate_limit()
+        response = session.get(f"{BASE_URL}/places/{place_id}", headers=PLACE_DETAILS_HEADERS,
+                               timeout=REQUEST_TIMEOUT)
         response.raise_for_status()
         
         data = response.json()
@@ -47,31 +46,24 @@ def get_place_details(place_id: str) -> Optional[Dict]:
         return None
 
 
-def update_restaurant_data(restaurant: Dict) -> Dict:
-    """Update a single restaurant with fresh Google Places data."""
+def update_restaurant_data(restaurant: Dict) -> Optional[Dict]:
+    """Update a single restaurant with fresh Google Places data (None if it could not be refreshed)."""
     
     place_id = restaurant.get('place_id')
     if not place_id:
-        print(f"No place_id found for: {restaurant['name']}")
-        return restaurant
-    
-    print(f"Updating: {restaurant['name']}")
+        print(f"❌ No place_id for: {restaurant['name']}")
+        return None
     
     # Get fresh data from Places API
     details = get_place_details(place_id)
     if not details:
-        print(f"  Failed to get updated details for: {restaurant['name']}")
-        return restaurant
+        print(f"❌ Failed to update: {restaurant['name']}")
+        return None
     
     # Update dynamic fields only (keep static data from original parse)
-    # Handle rating extraction safely (can be dict or float)
-    rating = details.get('rating', {})
-    if isinstance(rating, dict):
-        restaurant['google_rating'] = rating.get('value')
-        restaurant['rating'] = rating.get('value')  # Also set main rating field
-    elif isinstance(rating, (int, float)):
-        restaurant['google_rating'] = rating
-        restaurant['rating'] = rating
+    rating = coerce_rating(details.get('rating', {}))
+    restaurant['google_rating'] = rating
+    restaurant['rating'] = rating  # Also set main rating field
     
     restaurant['google_review_count'] = details.get('userRatingCount')
     restaurant['review_count'] = details.get('userRatingCount')
@@ -104,7 +96,6 @@ def update_restaurant_data(restaurant: Dict) -> Dict:
     # Update timestamp
     restaurant['last_updated'] = time.strftime('%Y-%m-%d %H:%M:%S')
     
-    print(f"  Successfully updated: {restaurant['name']}")
     return restaurant
 
 
@@ -127,30 +118,54 @@ def main():
         return
     
     # Load existing enriched restaurants
-    with open(input_file, 'r', encoding='utf-8') as f:
-        restaurants = json.load(f)
-    
-    print(f"Updating {len(restaurants)} restaurants...")
-    
-    updated_restaurants = []
-    for i, restaurant in enumerate(restaurants):
-        print(f"\nProgress: {i+1}/{len(restaurants)}")
-        
-        updated_restaurant = update_restaurant_data(restaurant)
-        updated_restaurants.append(updated_restaurant)
-        
-        # Rate limiting - Google Places API has quotas
-        time.sleep(0.1)  # 100ms delay between requests
-    
-    # Save updated data
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(updated_restaurants, f, indent=2, ensure_ascii=False)
+    with open(input_file, 'rb') as f:
+        restaurants = orjson.loads(f.read())
+    
+    # Successful refreshes are appended to a JSONL sidecar as they complete, so an
+    # interrupted refresh can resume where it stopped instead of starting over
+    progress_file = output_file.with_suffix('.jsonl.tmp')
+    updated = {}
+    if progress_file.exists():
+        with open(progress_file, 'rb') as f:
+            for line in f:
+                try:
+                    entry = orjson.loads(line)
+                except orjson.JSONDecodeError:
+                    continue  # Partial line from a killed run - that restaurant is redone
+                # Skip entries left over from a different input file
+                index = entry['index']
+                if index < len(restaurants) and restaurants[index].get('place_id') == entry['place_id']:
+                    updated[index] = entry['restaurant']
+        print(f"Resuming: {len(updated)} restaurants already updated")
+    
+    pending = [i for i in range(len(restaurants)) if i not in updated]
+    print(f"Updating {len(pending)} restaurants...")
+    
+    # Update concurrently
+    with open(progress_file, 'ab') as progress, \
+            run_rate_limited(update_restaurant_data, [restaurants[i] for i in pending]) as results:
+        for pending_index, restaurant in results:
+            if restaurant is not None:
+                index = pending[pending_index]
+                updated[index] = restaurant
+                progress.write(orjson.dumps({'index': index, 'place_id': restaurant['place_id'],
+                                             'restaurant': restaurant}) + b'\n')
+                progress.flush()
+    
+    # Keep the original order; restaurants that could not be refreshed keep their old data
+    updated_restaurants = [updated.get(i, restaurant) for i, restaurant in enumerate(restaurants)]
+    
+    # Save updated data - write a temp file and swap it in, so the input is never left half-written
+    tmp_file = output_file.with_suffix('.json.tmp')
+    with open(tmp_file, 'wb') as f:
+        f.write(orjson.dumps(updated_restaurants, option=orjson.OPT_INDENT_2))
+    os.replace(tmp_file, output_file)
+    progress_file.unlink()
     
     print(f"\nSaved updated data to: {output_file}")
     
     # Print summary
-    successful = sum(1 for r in updated_restaurants if r.get('place_id'))
-    print(f"Successfully updated: {successful}/{len(restaurants)} restaurants")
+    print(f"Successfully updated: {len(updated)}/{len(restaurants)} restaurants")
 
 
 if __name__ == '__main__':